@@ -1,22 +1,27 @@
 from flask import Flask, request, jsonify
 import logging
+import os
 import uuid
 import time
 from memgpt import create_client
 from types import SimpleNamespace
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Configure logging; set LOG_LEVEL=DEBUG to also log full request/response payloads
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(), format='%(asctime)s - %(levelname)s - %(message)s')
 
 app = Flask(__name__)
 
 # MemGPT Configuration
 API_TOKEN = "{API KEY}"  # Replace with your actual MemGPT API token
 MEMGPT_BASE_URL = 'http://localhost:8283'  # Replace with actual URL
+AGENT_ID_CACHE_TTL = 10  # Seconds before the cached agent list is re-fetched
 
 # Create MemGPT client
 memgpt_client = create_client(base_url=MEMGPT_BASE_URL, token=API_TOKEN)
 
+# Cache of (fetch time, agent name -> agent ID), refreshed on misses and after AGENT_ID_CACHE_TTL
+agent_id_cache = (0.0, {})
+
 @app.route('/chat/completions', methods=['POST'])
 def chat_completions():
     try:
@@ -28,7 +33,8 @@ def chat_completions():
         agent_name = data['model']
         input_messages = data['messages']
 
-        logging.info(f"Request received for agent: {agent_name} with messages: {input_messages}")
+        logging.info("Request received for agent: %s", agent_name)
+        logging.debug("Request messages: %s", input_messages)
 
         agent_id = get_memgpt_agent_id(agent_name)
         if not agent_id:
@@ -42,12 +48,15 @@ def chat_completions():
 
         # Process the response to structure it correctly
         formatted_choices = []
+        completion_tokens = 0
         for message in memgpt_response.messages:
             # Assuming each message in response contains 'content', 'internal_monologue', and 'function_call'
+            content = message.get('assistant_message', '')
+            completion_tokens += len(content.split())
             choice = {
                 "message": {
                     "role": "assistant",
-                    "content": message.get('assistant_message', ''),
+                    "content": content,
                     "memgpt_data": {
                         "internal_monologue": message.get('internal_monologue', ''),
                         "function_call": message.get('function_call', {})
@@ -57,6 +66,8 @@ def chat_completions():
             }
             formatted_choices.append(choice)
 
+        prompt_tokens = len(prompt.split())
+
         # Create the final structured response
         response = {
             "id": f"chatcmpl-{uuid.uuid4()}",
@@ -65,13 +76,13 @@ def chat_completions():
             "model": agent_name,
             "choices": formatted_choices,
             "usage": {
-                "prompt_tokens": len(prompt.split()),
-                "completion_tokens": sum(len(choice['message']['content'].split()) for choice in formatted_choices),
-                "total_tokens": len(prompt.split()) + sum(len(choice['message']['content'].split()) for choice in formatted_choices)
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
             }
         }
 
-        logging.info(f"Response prepared: {response}")
+        logging.debug("Response prepared: %s", response)
         return jsonify(response)
 
     except Exception as e:
@@ -82,13 +93,21 @@ def chat_completions():
 def get_memgpt_agent_id(agent_name: str) -> str:
     """
     Helper function to retrieve the MemGPT agent ID based on the agent name.
+    Lookups are served from a name -> ID cache; the agent list is re-fetched
+    when a name is not in the cache or the cache is older than AGENT_ID_CACHE_TTL.
     Returns None if the agent is not found.
     """
-    agents = memgpt_client.list_agents().agents
-    for agent in agents:
-        if agent['name'] == agent_name:
-            return agent['id']
-    return None
+    global agent_id_cache
+    fetched_at, agent_ids = agent_id_cache
+    now = time.monotonic()
+    if agent_name not in agent_ids or now - fetched_at > AGENT_ID_CACHE_TTL:
+        agents = memgpt_client.list_agents().agents
+        agent_ids = {}
+        for agent in agents:
+            agent_ids.setdefault(agent['name'], agent['id'])
+        # Rebind as a single tuple so concurrent requests never see a partial cache
+        agent_id_cache = (now, agent_ids)
+    return agent_ids.get(agent_name)
 
 if __name__ == '__main__':
     app.run(debug=True)